@@ -6,12 +6,14 @@ setup(
     description="AeyeGuard MCP Service - Security Static Analysis",
     author="ettoremessina",
     packages=find_packages(),
+    package_data={"src.analyzers": ["prompts/*.txt"]},
     install_requires=[
         "langchain>=0.1.0",
         "langchain-community>=0.0.13",
         "mcp>=0.9.0",
         "pydantic>=2.0.0",
         "httpx>=0.25.0",
+        "orjson>=3.9.0",
         "python-dotenv>=1.0.0",
     ],
     python_requires=">=3.8",
@@ -31,6 +31,9 @@ source venv/bin/activate
 echo "Checking dependencies..."
 pip install -q -r requirements.txt
 
+# Precompile the service so later imports load cached bytecode
+python -m compileall -q src
+
 echo ""
 echo "Starting MCP service..."
 echo "Press Ctrl+C to stop"
@@ -9,22 +9,22 @@ This service exposes HTTP endpoints for integration with IDEs.
 """
 
 import os
-import sys
+import json
+import asyncio
 import logging
-from typing import Optional
+from typing import Optional, AsyncIterator
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 
-# Add src directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 import uvicorn
 
-from src.models import AnalysisRequest, LanguageType
-from src.services import LanguageDetector, LLMService
-from src.analyzers import (
+from .models import AnalysisRequest, LanguageType, SECURITY_ISSUE_LIST_ADAPTER
+from .services import DETECTOR, LLMService
+from .analyzers import (
+    BaseSecurityAnalyzer,
     CSharpSecurityAnalyzer,
     ReactTypeScriptAnalyzer,
     ReactJavaScriptAnalyzer,
@@ -44,6 +44,8 @@ logger = logging.getLogger(__name__)
 
 class HealthCheckResponse(BaseModel):
     """Health check response model"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     service: str
     version: str
     status: str
@@ -53,6 +55,8 @@ class HealthCheckResponse(BaseModel):
 
 class LanguageInfo(BaseModel):
     """Language information model"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     language: str
     description: str
     extensions: list[str]
@@ -61,6 +65,8 @@ class LanguageInfo(BaseModel):
 
 class AnalysisResponse(BaseModel):
     """Analysis response model"""
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     language: str
     summary: str
     issues: list[dict]
@@ -68,6 +74,10 @@ class AnalysisResponse(BaseModel):
     completion_status: str = "✅ ANALYSIS FINISHED"
 
 
+# Serializes /analyze/batch results in one pydantic-core call
+_RESPONSE_LIST_ADAPTER = TypeAdapter(list[AnalysisResponse])
+
+
 class SecurityAnalyzerMCP:
     """MCP Service for security analysis"""
 
@@ -82,7 +92,7 @@ class SecurityAnalyzerMCP:
 
         # Initialize services
         self.llm_service = LLMService()
-        self.language_detector = LanguageDetector()
+        self.language_detector = DETECTOR
 
         # Initialize analyzers
         self.analyzers = {
@@ -94,6 +104,9 @@ class SecurityAnalyzerMCP:
 
         logger.info(f"Loaded {len(self.analyzers)} analyzers")
 
+        # Supported languages only depend on the analyzers above
+        self._languages = self._build_language_list()
+
     async def analyze_security(self, request: AnalysisRequest) -> AnalysisResponse:
         """
         Perform security analysis on code.
@@ -104,61 +117,36 @@ class SecurityAnalyzerMCP:
         Returns:
             AnalysisResponse with analysis results
         """
-        try:
-            # Detect language
-            if request.language == "auto" or not request.language:
-                detected_lang = self.language_detector.detect_language(
-                    request.code, request.file_path
-                )
-            else:
-                try:
-                    detected_lang = LanguageType(request.language)
-                except ValueError:
-                    detected_lang = LanguageType.UNKNOWN
-
-            # Check if language is supported
-            if detected_lang == LanguageType.UNKNOWN:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unable to detect language or unsupported language type."
-                )
-
-            if detected_lang not in self.analyzers:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"No analyzer available for {detected_lang.value}"
-                )
+        return await self._run_analysis(self._select_analyzer(request), request)
 
-            # Get appropriate analyzer
-            analyzer = self.analyzers[detected_lang]
+    async def _run_analysis(
+        self, analyzer: BaseSecurityAnalyzer, request: AnalysisRequest
+    ) -> AnalysisResponse:
+        """
+        Analyze a request with an already selected analyzer.
 
-            logger.info(f"Analyzing code with {detected_lang.value} analyzer")
+        Args:
+            analyzer: Analyzer selected for the request
+            request: AnalysisRequest containing code, file_path, and language
 
-            # Perform analysis
-            result = await analyzer.analyze(request.code, request.file_path)
+        Returns:
+            AnalysisResponse with analysis results
+        """
+        try:
+            # Perform analysis; LLMService bounds the concurrent LLM requests
+            result = await analyzer.analyze(
+                request.code, request.file_path, preprocess=request.preprocess
+            )
 
             # Log completion
             logger.info(f"✅ Analysis completed: {result.analysis_metadata.get('total_issues', 0)} issues found")
 
             # Convert to response format
-            issues_list = [
-                {
-                    "id": issue.id,
-                    "title": issue.title,
-                    "description": issue.description,
-                    "severity": issue.severity if isinstance(issue.severity, str) else issue.severity.value,
-                    "line_number": issue.line_number,
-                    "column_number": issue.column_number,
-                    "file_path": issue.file_path,
-                    "code_snippet": issue.code_snippet,
-                    "remediation": issue.remediation,
-                    "references": issue.references,
-                }
-                for issue in result.issues
-            ]
+            issues_list = SECURITY_ISSUE_LIST_ADAPTER.dump_python(result.issues, mode="json")
 
-            return AnalysisResponse(
-                language=result.language if isinstance(result.language, str) else result.language.value,
+            # Fields come from an already validated AnalysisResult
+            return AnalysisResponse.model_construct(
+                language=result.language,
                 summary=result.summary,
                 issues=issues_list,
                 metadata=result.analysis_metadata,
@@ -171,6 +159,126 @@ class SecurityAnalyzerMCP:
             logger.error(f"Analysis failed: {str(e)}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+    def analyze_security_stream(self, request: AnalysisRequest) -> AsyncIterator[str]:
+        """
+        Perform security analysis on code, streaming issues as they are found.
+
+        The analyzer is selected eagerly so unsupported languages raise before streaming starts.
+
+        Args:
+            request: AnalysisRequest containing code, file_path, and language
+
+        Returns:
+            Async iterator of newline-delimited JSON issues
+        """
+        analyzer = self._select_analyzer(request)
+        return self._stream_issues(analyzer, request)
+
+    async def _stream_issues(
+        self, analyzer: BaseSecurityAnalyzer, request: AnalysisRequest
+    ) -> AsyncIterator[str]:
+        """
+        Run a streaming analysis and encode each issue as one JSON line.
+
+        Args:
+            analyzer: Analyzer selected for the request
+            request: AnalysisRequest containing code, file_path, and language
+
+        Yields:
+            One JSON document per line; a final {"error": ...} line if analysis fails
+        """
+        count = 0
+        try:
+            async for issue in analyzer.analyze_stream(
+                request.code, request.file_path, preprocess=request.preprocess
+            ):
+                count += 1
+                yield issue.model_dump_json() + "\n"
+
+            logger.info(f"✅ Streaming analysis completed: {count} issues found")
+
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Streaming analysis failed: {str(e)}", exc_info=True)
+            yield json.dumps({"error": f"Analysis failed: {str(e)}"}) + "\n"
+
+    def _select_analyzer(self, request: AnalysisRequest) -> BaseSecurityAnalyzer:
+        """
+        Resolve the analyzer for a request's language.
+
+        Args:
+            request: AnalysisRequest containing code, file_path, and language
+
+        Returns:
+            Analyzer registered for the detected or requested language
+
+        Raises:
+            HTTPException: If the language is unknown or has no analyzer
+        """
+        # Detect language
+        if request.language == "auto" or not request.language:
+            detected_lang = self.language_detector.detect_language(
+                request.code, request.file_path
+            )
+        else:
+            try:
+                detected_lang = LanguageType(request.language)
+            except ValueError:
+                detected_lang = LanguageType.UNKNOWN
+
+        # Check if language is supported
+        if detected_lang == LanguageType.UNKNOWN:
+            raise HTTPException(
+                status_code=400,
+                detail="Unable to detect language or unsupported language type."
+            )
+
+        if detected_lang not in self.analyzers:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No analyzer available for {detected_lang.value}"
+            )
+
+        logger.info(f"Analyzing code with {detected_lang.value} analyzer")
+
+        return self.analyzers[detected_lang]
+
+    async def analyze_batch(self, requests: list[AnalysisRequest]) -> list[AnalysisResponse]:
+        """
+        Perform security analysis on several code samples concurrently.
+
+        Every request's language is resolved before any analysis starts, and if one
+        analysis fails the others are cancelled so they stop using the LLM.
+
+        Args:
+            requests: AnalysisRequests to analyze
+
+        Returns:
+            AnalysisResponses in the same order as the requests
+
+        Raises:
+            HTTPException: If a request has no analyzer (the detail names its index)
+                or an analysis fails
+        """
+        analyzers = []
+        for index, request in enumerate(requests):
+            try:
+                analyzers.append(self._select_analyzer(request))
+            except HTTPException as e:
+                raise HTTPException(status_code=e.status_code, detail=f"Request {index}: {e.detail}")
+
+        tasks = [
+            asyncio.ensure_future(self._run_analysis(analyzer, request))
+            for analyzer, request in zip(analyzers, requests)
+        ]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # The batch has failed, so stop the remaining analyses
+            for task in tasks:
+                task.cancel()
+            raise
+
     async def health_check(self) -> HealthCheckResponse:
         """
         Check service health.
@@ -210,6 +318,15 @@ class SecurityAnalyzerMCP:
         """
         List supported languages.
 
+        Returns:
+            List of LanguageInfo objects
+        """
+        return self._languages
+
+    def _build_language_list(self) -> list[LanguageInfo]:
+        """
+        Build the supported language list served by list_supported_languages.
+
         Returns:
             List of LanguageInfo objects
         """
@@ -256,6 +373,7 @@ async def lifespan(_app: FastAPI):
     yield
 
     logger.info("Shutting down Security Analyzer MCP Service...")
+    await service_instance.llm_service.aclose()
     service_instance = None
 
 
@@ -278,6 +396,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "analyze": "/analyze",
+            "analyze_stream": "/analyze/stream",
+            "analyze_batch": "/analyze/batch",
             "languages": "/languages",
         }
     }
@@ -301,12 +421,52 @@ async def analyze(request: AnalysisRequest):
     - code: Source code to analyze (required)
     - file_path: Optional file path for context and language detection
     - language: Programming language (auto, csharp, react_typescript, react_javascript)
+    - preprocess: Strip comments before analysis (default: true)
     """
     if service_instance is None:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     logger.info(f"Received analysis request for {request.language or 'auto-detect'}")
-    return await service_instance.analyze_security(request)
+    response = await service_instance.analyze_security(request)
+
+    # Serialize with pydantic-core directly; response_model still documents the schema
+    return Response(content=response.model_dump_json(), media_type="application/json")
+
+
+@app.post("/analyze/stream")
+async def analyze_stream(request: AnalysisRequest):
+    """
+    Analyze code and stream issues as newline-delimited JSON.
+
+    Each line is one issue, sent as soon as the LLM completes it. If the analysis
+    fails after streaming has started, the last line is {"error": "..."}.
+    """
+    if service_instance is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+
+    logger.info(f"Received streaming analysis request for {request.language or 'auto-detect'}")
+    return StreamingResponse(
+        service_instance.analyze_security_stream(request),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/analyze/batch", response_model=list[AnalysisResponse])
+async def analyze_batch(requests: list[AnalysisRequest]):
+    """
+    Analyze several code samples concurrently.
+
+    Accepts a list of /analyze request bodies and returns the results in the same order.
+    Concurrent LLM calls are bounded by MCP_LLM_CONCURRENCY. An item with an unsupported
+    language fails the batch with a 400 naming its index before any analysis starts.
+    """
+    if service_instance is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+
+    logger.info(f"Received batch analysis request for {len(requests)} item(s)")
+    responses = await service_instance.analyze_batch(requests)
+
+    return Response(content=_RESPONSE_LIST_ADAPTER.dump_json(responses), media_type="application/json")
 
 
 @app.get("/languages", response_model=list[LanguageInfo])
@@ -318,69 +478,85 @@ async def languages():
     return await service_instance.list_supported_languages()
 
 
+# Static MCP tool definitions served by /mcp/tools
+_MCP_TOOLS_RESPONSE = {
+    "tools": [
+        {
+            "name": "analyze_security",
+            "description": "Performs comprehensive security analysis on source code",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "Source code to analyze",
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "Optional file path for context and language detection",
+                    },
+                    "language": {
+                        "type": "string",
+                        "description": "Programming language (auto, csharp, react_typescript, react_javascript, java)",
+                        "enum": ["auto", "csharp", "react_typescript", "react_javascript", "java"],
+                        "default": "auto",
+                    },
+                    "preprocess": {
+                        "type": "boolean",
+                        "description": "Strip comments before analysis",
+                        "default": True,
+                    },
+                },
+                "required": ["code"],
+            },
+        },
+        {
+            "name": "health_check",
+            "description": "Verifies service health and dependency availability",
+            "inputSchema": {
+                "type": "object",
+                "properties": {},
+            },
+        },
+        {
+            "name": "list_supported_languages",
+            "description": "Lists all supported programming languages and their metadata",
+            "inputSchema": {
+                "type": "object",
+                "properties": {},
+            },
+        },
+    ]
+}
+
+
 @app.get("/mcp/tools")
 async def mcp_tools():
     """
     MCP-compatible tools endpoint.
     Returns the list of available tools in MCP format.
     """
-    return {
-        "tools": [
-            {
-                "name": "analyze_security",
-                "description": "Performs comprehensive security analysis on source code",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {
-                        "code": {
-                            "type": "string",
-                            "description": "Source code to analyze",
-                        },
-                        "file_path": {
-                            "type": "string",
-                            "description": "Optional file path for context and language detection",
-                        },
-                        "language": {
-                            "type": "string",
-                            "description": "Programming language (auto, csharp, react_typescript, react_javascript, java)",
-                            "enum": ["auto", "csharp", "react_typescript", "react_javascript", "java"],
-                            "default": "auto",
-                        },
-                    },
-                    "required": ["code"],
-                },
-            },
-            {
-                "name": "health_check",
-                "description": "Verifies service health and dependency availability",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {},
-                },
-            },
-            {
-                "name": "list_supported_languages",
-                "description": "Lists all supported programming languages and their metadata",
-                "inputSchema": {
-                    "type": "object",
-                    "properties": {},
-                },
-            },
-        ]
-    }
+    return _MCP_TOOLS_RESPONSE
 
 
 def main():
     """Main entry point"""
     host = os.getenv("MCP_HOST", "0.0.0.0")
     port = int(os.getenv("MCP_PORT", "8000"))
+    workers = int(os.getenv("MCP_WORKERS", "1"))
 
-    logger.info(f"Starting server on {host}:{port}")
+    logger.info(f"Starting server on {host}:{port} with {workers} worker(s)")
 
     uvicorn.run(
-        app,
+        # Multiple workers need an import string so each process can load the app
+        app if workers == 1 else "src.AeyeGuard_mcp:app",
         host=host,
         port=port,
+        workers=workers,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        limit_concurrency=int(os.getenv("MCP_MAX_CONC", "1000")),
+        timeout_keep_alive=30,
         log_level="info",
     )
 
@@ -1,14 +1,70 @@
+import os
 import re
-import uuid
+import hashlib
+import secrets
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from src.models import SecurityIssue, AnalysisResult, LanguageType, SeverityLevel
-from src.services import LLMService
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, AsyncIterator, Pattern, Tuple
+from pydantic import ValidationError
+from ..models import (
+    SecurityIssue,
+    AnalysisResult,
+    LanguageType,
+    SeverityLevel,
+    SECURITY_ISSUE_LIST_ADAPTER,
+)
+from ..services import LLMService, StreamOutcome
+
+# Comment patterns used by preprocess_code
+_RE_LINE_COMMENT = re.compile(r"//.*?$", re.MULTILINE)
+_RE_BLOCK_COMMENT = re.compile(r"(/\*.*?\*/)", re.DOTALL)
+
+# Severity lookup used to normalize LLM-provided severity strings
+_SEVERITY_LEVELS = {level.value: level for level in SeverityLevel}
+
+# Directory holding the security rules prompts
+_PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """
+    Load a security rules prompt, reading each file once per process.
+
+    Args:
+        name: File name within the prompts directory
+
+    Returns:
+        Prompt text
+    """
+    return (_PROMPTS_DIR / name).read_text(encoding="utf-8")
+
+
+def _offset_line_number(data: Any, line_offset: int) -> Any:
+    """
+    Shift the line number of an issue found in a chunk to the full code.
+
+    Args:
+        data: Raw issue dictionary from the LLM
+        line_offset: Number of lines before the chunk
+
+    Returns:
+        Issue dictionary with an absolute line number
+    """
+    if line_offset and isinstance(data, dict) and isinstance(data.get("line_number"), int):
+        return {**data, "line_number": data["line_number"] + line_offset}
+    return data
 
 
 class BaseSecurityAnalyzer(ABC):
     """Base class for language-specific security analyzers"""
 
+    # Identifiers of security-relevant APIs and data for this language. When the
+    # sink prefilter is enabled, code matching none of them skips the LLM.
+    SINK_PATTERN: Optional[Pattern[str]] = None
+
     def __init__(self, llm_service: LLMService):
         """
         Initialize the analyzer with an LLM service.
@@ -18,6 +74,14 @@ class BaseSecurityAnalyzer(ABC):
         """
         self.llm_service = llm_service
 
+        # LRU cache of validated LLM results, keyed by a digest of model, prompt and code.
+        # Issues are frozen and stored without the request's file_path, which varies.
+        self._cache_size = int(os.getenv("AEYEGUARD_CACHE_SIZE", "512"))
+        self._cache: "OrderedDict[bytes, List[SecurityIssue]]" = OrderedDict()
+
+        # Opt-in: the rules also cover issues without a lexical sink (e.g. missing checks)
+        self._sink_prefilter = os.getenv("AEYEGUARD_SINK_PREFILTER", "false").lower() in ("1", "true", "yes")
+
     @abstractmethod
     def get_language_type(self) -> LanguageType:
         """Return the language type this analyzer handles"""
@@ -39,55 +103,78 @@ class BaseSecurityAnalyzer(ABC):
         Returns:
             Preprocessed code
         """
-        # Remove single-line comments but keep line breaks
-        code = re.sub(r"//.*?$", "", code, flags=re.MULTILINE)
+        # Both comment forms need a "/", so code without one has nothing to strip
+        if "/" not in code:
+            return code
 
-        # Remove multi-line comments but preserve line count
-        def replace_multiline_comment(match):
-            return "\n" * match.group(0).count("\n")
+        # Remove single-line comments but keep line breaks
+        code = _RE_LINE_COMMENT.sub("", code)
 
-        code = re.sub(r"/\*.*?\*/", replace_multiline_comment, code, flags=re.DOTALL)
+        # Remove multi-line comments but preserve line count.
+        # split() with a capturing group puts the comments at odd indices.
+        parts = _RE_BLOCK_COMMENT.split(code)
+        parts[1::2] = ["\n" * comment.count("\n") for comment in parts[1::2]]
 
-        return code
+        return "".join(parts)
 
-    async def analyze(self, code: str, file_path: str = None) -> AnalysisResult:
+    async def analyze(
+        self, code: str, file_path: str = None, preprocess: bool = True
+    ) -> AnalysisResult:
         """
         Perform security analysis on the code.
 
         Args:
             code: Source code to analyze
             file_path: Optional file path for context
+            preprocess: Whether to strip comments before analysis
 
         Returns:
             AnalysisResult containing detected issues
         """
         try:
             # Preprocess code
-            preprocessed_code = self.preprocess_code(code)
+            preprocessed_code = self.preprocess_code(code) if preprocess else code
 
             # Get security rules prompt
             prompt = self.get_security_rules_prompt()
 
-            # Analyze with LLM
-            llm_response = await self.llm_service.analyze_code(preprocessed_code, prompt)
+            # Reuse a previous result for identical code
+            cache_key = self._cache_key(preprocessed_code, prompt)
+            issues = self._cache_get(cache_key)
+            cache_hit = issues is not None
+            llm_skipped = False
 
-            # Parse response
-            issues_data = self.llm_service.parse_llm_response(llm_response)
+            if not cache_hit and self._can_skip_llm(preprocessed_code):
+                # Nothing for the LLM to analyze
+                issues = []
+                llm_skipped = True
+            elif not cache_hit:
+                # Analyze with LLM; unparseable output may be transient, so it is not cached
+                issues_data, parsed = await self._analyze_with_llm(preprocessed_code, prompt)
 
-            # Convert to SecurityIssue objects
-            issues = self._create_security_issues(issues_data, file_path)
+                # Convert to SecurityIssue objects
+                issues = self._create_security_issues(issues_data)
+                if parsed:
+                    self._cache_put(cache_key, issues)
+
+            issues = self._with_file_path(issues, file_path)
+
+            # Count issues per severity once for both summary and metadata
+            severity_counts = Counter(issue.severity for issue in issues)
 
             # Generate summary
-            summary = self._generate_summary(issues)
+            summary = self._generate_summary(issues, severity_counts)
 
             # Create metadata
             metadata = {
                 "total_issues": len(issues),
-                "critical_count": sum(1 for i in issues if i.severity == SeverityLevel.CRITICAL),
-                "high_count": sum(1 for i in issues if i.severity == SeverityLevel.HIGH),
-                "medium_count": sum(1 for i in issues if i.severity == SeverityLevel.MEDIUM),
-                "low_count": sum(1 for i in issues if i.severity == SeverityLevel.LOW),
+                "critical_count": severity_counts[SeverityLevel.CRITICAL],
+                "high_count": severity_counts[SeverityLevel.HIGH],
+                "medium_count": severity_counts[SeverityLevel.MEDIUM],
+                "low_count": severity_counts[SeverityLevel.LOW],
                 "analyzer": self.__class__.__name__,
+                "cache_hit": cache_hit,
+                "llm_skipped": llm_skipped,
                 "status": "COMPLETED",
                 "completion_message": "✅ Analysis finished successfully",
             }
@@ -108,6 +195,166 @@ class BaseSecurityAnalyzer(ABC):
                 analysis_metadata={"error": str(e), "analyzer": self.__class__.__name__},
             )
 
+    async def analyze_stream(
+        self, code: str, file_path: str = None, preprocess: bool = True
+    ) -> AsyncIterator[SecurityIssue]:
+        """
+        Perform security analysis, yielding issues as the LLM reports them.
+
+        Args:
+            code: Source code to analyze
+            file_path: Optional file path for context
+            preprocess: Whether to strip comments before analysis
+
+        Yields:
+            Detected SecurityIssue objects
+        """
+        preprocessed_code = self.preprocess_code(code) if preprocess else code
+        prompt = self.get_security_rules_prompt()
+
+        cache_key = self._cache_key(preprocessed_code, prompt)
+        issues = self._cache_get(cache_key)
+        if issues is not None:
+            for issue in self._with_file_path(issues, file_path):
+                yield issue
+            return
+
+        if self._can_skip_llm(preprocessed_code):
+            return
+
+        issues = []
+        complete = True
+        for line_offset, chunk in self.llm_service.split_code(preprocessed_code):
+            outcome = StreamOutcome()
+            async for data in self.llm_service.stream_analyze_code(chunk, prompt, outcome):
+                new_issues = self._create_security_issues([_offset_line_number(data, line_offset)])
+                issues.extend(new_issues)
+                for issue in self._with_file_path(new_issues, file_path):
+                    yield issue
+            complete = complete and outcome.complete
+
+        # Like analyze(), only cache when every chunk produced a whole, parseable array
+        if complete:
+            self._cache_put(cache_key, issues)
+
+    async def _analyze_with_llm(
+        self, code: str, prompt: str
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Send code to the LLM, in concurrent chunks when it is too long.
+
+        Args:
+            code: Code exactly as it will be sent to the LLM
+            prompt: Security rules prompt
+
+        Returns:
+            Issue dictionaries with line numbers relative to the full code, and
+            whether every LLM response could be parsed
+        """
+        chunks = self.llm_service.split_code(code)
+        if len(chunks) == 1:
+            responses = [await self.llm_service.analyze_code(code, prompt)]
+        else:
+            responses = await self.llm_service.analyze_many(
+                [(chunk, prompt) for _, chunk in chunks]
+            )
+
+        issues_data = []
+        parsed = True
+        for (line_offset, _), response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                raise response
+            chunk_issues = self.llm_service.try_parse_llm_response(response)
+            if chunk_issues is None:
+                parsed = False
+                continue
+            issues_data.extend(_offset_line_number(data, line_offset) for data in chunk_issues)
+
+        return issues_data, parsed
+
+    def _can_skip_llm(self, code: str) -> bool:
+        """
+        Check whether code can be reported clean without asking the LLM.
+
+        Blank code is always skipped. With AEYEGUARD_SINK_PREFILTER enabled,
+        code that matches none of SINK_PATTERN is skipped too.
+
+        Args:
+            code: Code as it would be sent to the LLM
+
+        Returns:
+            True if the LLM call can be skipped
+        """
+        if not code.strip():
+            return True
+        if self._sink_prefilter and self.SINK_PATTERN is not None:
+            return self.SINK_PATTERN.search(code) is None
+        return False
+
+    def _cache_key(self, code: str, prompt: str) -> bytes:
+        """
+        Compute the cache key for an LLM request.
+
+        Args:
+            code: Code exactly as it will be sent to the LLM
+            prompt: Security rules prompt sent with the code
+
+        Returns:
+            Digest identifying the model, prompt and code
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.llm_service.model, prompt, code):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+
+    def _cache_get(self, key: bytes) -> Optional[List[SecurityIssue]]:
+        """
+        Look up cached issues and mark them as most recently used.
+
+        Args:
+            key: Digest from _cache_key
+
+        Returns:
+            Cached list of SecurityIssue objects, or None on a miss
+        """
+        issues = self._cache.get(key)
+        if issues is not None:
+            self._cache.move_to_end(key)
+        return issues
+
+    def _cache_put(self, key: bytes, issues: List[SecurityIssue]) -> None:
+        """
+        Store issues, evicting the least recently used entry when full.
+
+        Args:
+            key: Digest from _cache_key
+            issues: Validated issues, without the request's file_path
+        """
+        if self._cache_size <= 0:
+            return
+        self._cache[key] = issues
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _with_file_path(
+        issues: List[SecurityIssue], file_path: Optional[str]
+    ) -> List[SecurityIssue]:
+        """
+        Attach the request's file path to issues, which may be shared with the cache.
+
+        Args:
+            issues: Issues created without a request file path
+            file_path: Optional file path of the analyzed code
+
+        Returns:
+            Issues with file_path set, or the same list when there is no file path
+        """
+        if not file_path:
+            return issues
+        return [issue.model_copy(update={"file_path": file_path}) for issue in issues]
+
     def _create_security_issues(
         self, issues_data: List[Dict[str, Any]], file_path: str = None
     ) -> List[SecurityIssue]:
@@ -121,41 +368,53 @@ class BaseSecurityAnalyzer(ABC):
         Returns:
             List of SecurityIssue objects
         """
+        candidates = []
+        # One getrandom() call for all fallback IDs instead of one per issue
+        id_pool = secrets.token_bytes(4 * len(issues_data)).hex()
+        for index, data in enumerate(issues_data):
+            if not isinstance(data, dict):
+                # Skip malformed issues; the LLM output is untrusted
+                continue
+            severity = _SEVERITY_LEVELS.get(
+                str(data.get("severity") or "MEDIUM").upper(), SeverityLevel.MEDIUM
+            )
+            candidates.append({
+                "id": data.get("id") or f"SEC-{id_pool[index * 8:index * 8 + 8]}",
+                "title": data.get("title") or "Security Issue",
+                "description": data.get("description") or "No description provided",
+                "severity": severity,
+                "line_number": data.get("line_number"),
+                "column_number": data.get("column_number"),
+                "file_path": file_path or data.get("file_path"),
+                "code_snippet": data.get("code_snippet"),
+                "remediation": data.get("remediation"),
+                "references": data.get("references") or [],
+            })
+
+        try:
+            # Validate the whole list in one pydantic-core call
+            return SECURITY_ISSUE_LIST_ADAPTER.validate_python(candidates)
+        except ValidationError:
+            pass
+
+        # Some issue is malformed: validate one by one and skip the bad ones
         issues = []
-        for idx, data in enumerate(issues_data):
+        for candidate in candidates:
             try:
-                # Parse severity
-                severity_str = data.get("severity", "MEDIUM").upper()
-                try:
-                    severity = SeverityLevel(severity_str)
-                except ValueError:
-                    severity = SeverityLevel.MEDIUM
-
-                issue = SecurityIssue(
-                    id=data.get("id", f"SEC-{uuid.uuid4().hex[:8]}"),
-                    title=data.get("title", "Security Issue"),
-                    description=data.get("description", "No description provided"),
-                    severity=severity,
-                    line_number=data.get("line_number"),
-                    column_number=data.get("column_number"),
-                    file_path=file_path or data.get("file_path"),
-                    code_snippet=data.get("code_snippet"),
-                    remediation=data.get("remediation"),
-                    references=data.get("references", []),
-                )
-                issues.append(issue)
-            except Exception as e:
-                # Skip malformed issues
+                issues.append(SecurityIssue.model_validate(candidate))
+            except ValidationError:
                 continue
-
         return issues
 
-    def _generate_summary(self, issues: List[SecurityIssue]) -> str:
+    def _generate_summary(
+        self, issues: List[SecurityIssue], severity_counts: Counter
+    ) -> str:
         """
         Generate a summary of the analysis results.
 
         Args:
             issues: List of detected security issues
+            severity_counts: Number of issues per severity level
 
         Returns:
             Summary string with completion message
@@ -164,10 +423,10 @@ class BaseSecurityAnalyzer(ABC):
         if not issues:
             summary = "No security issues detected."
         else:
-            critical = sum(1 for i in issues if i.severity == SeverityLevel.CRITICAL)
-            high = sum(1 for i in issues if i.severity == SeverityLevel.HIGH)
-            medium = sum(1 for i in issues if i.severity == SeverityLevel.MEDIUM)
-            low = sum(1 for i in issues if i.severity == SeverityLevel.LOW)
+            critical = severity_counts[SeverityLevel.CRITICAL]
+            high = severity_counts[SeverityLevel.HIGH]
+            medium = severity_counts[SeverityLevel.MEDIUM]
+            low = severity_counts[SeverityLevel.LOW]
 
             parts = []
             if critical:
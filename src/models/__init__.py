@@ -4,6 +4,7 @@ from .data_models import (
     AnalysisResult,
     LanguageType,
     SeverityLevel,
+    SECURITY_ISSUE_LIST_ADAPTER,
 )
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "AnalysisResult",
     "LanguageType",
     "SeverityLevel",
+    "SECURITY_ISSUE_LIST_ADAPTER",
 ]
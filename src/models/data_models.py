@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 
 
 class SeverityLevel(str, Enum):
@@ -33,8 +33,17 @@ class SecurityIssue(BaseModel):
     remediation: Optional[str] = Field(None, description="Suggested fix or remediation steps")
     references: Optional[List[str]] = Field(default_factory=list, description="External references (CVE, OWASP, etc.)")
 
-    class Config:
-        use_enum_values = True
+    @field_validator("severity", mode="before")
+    @classmethod
+    def normalize_severity(cls, value: Any) -> Any:
+        """Accept severity names in any case"""
+        return value.upper() if isinstance(value, str) else value
+
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+
+
+# Validates or serializes a whole list of issues in one pydantic-core call
+SECURITY_ISSUE_LIST_ADAPTER = TypeAdapter(List[SecurityIssue])
 
 
 class AnalysisRequest(BaseModel):
@@ -42,9 +51,9 @@ class AnalysisRequest(BaseModel):
     code: str = Field(..., description="Source code to analyze")
     file_path: Optional[str] = Field(None, description="File path for context and language detection")
     language: Optional[str] = Field("auto", description="Programming language (auto, csharp, react_typescript, react_javascript, java)")
+    preprocess: bool = Field(True, description="Strip comments before analysis")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
 
 
 class AnalysisResult(BaseModel):
@@ -54,5 +63,4 @@ class AnalysisResult(BaseModel):
     summary: str = Field(..., description="Summary of the analysis")
     analysis_metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional analysis metadata")
 
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
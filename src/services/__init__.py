@@ -1,4 +1,4 @@
-from .language_detector import LanguageDetector
-from .llm_service import LLMService
+from .language_detector import LanguageDetector, DETECTOR
+from .llm_service import LLMService, StreamOutcome
 
-__all__ = ["LanguageDetector", "LLMService"]
+__all__ = ["LanguageDetector", "DETECTOR", "LLMService", "StreamOutcome"]
@@ -1,6 +1,52 @@
+import os
 import re
-from typing import Optional
-from src.models import LanguageType
+import hashlib
+from collections import OrderedDict, defaultdict
+from itertools import chain, zip_longest
+from typing import Optional, Pattern
+from ..models import LanguageType
+
+
+# Languages scored by content-based detection, in tie-breaking order
+_SCORED_LANGUAGES = [lang for lang in LanguageType if lang != LanguageType.UNKNOWN]
+
+
+def _compile_patterns(
+    language_patterns: dict[LanguageType, list[str]]
+) -> tuple[list[tuple[Pattern[str], list[int]]], list[int]]:
+    """
+    Compile detection patterns, merging patterns shared by several languages.
+
+    Patterns are interleaved across languages so that every language gains
+    score at the same pace, which lets a clear winner be decided early.
+    Languages are referred to by their index in _SCORED_LANGUAGES.
+
+    Args:
+        language_patterns: Pattern strings per language
+
+    Returns:
+        (compiled pattern, language indices it scores for) pairs, and the
+        number of patterns per language index
+    """
+    lang_index = {lang: index for index, lang in enumerate(_SCORED_LANGUAGES)}
+    indices_by_pattern: dict[str, list[int]] = defaultdict(list)
+    rounds = zip_longest(*(
+        [(lang, pattern) for pattern in patterns]
+        for lang, patterns in language_patterns.items()
+    ))
+    for lang, pattern in filter(None, chain.from_iterable(rounds)):
+        indices_by_pattern[pattern].append(lang_index[lang])
+
+    counts = [0] * len(_SCORED_LANGUAGES)
+    for indices in indices_by_pattern.values():
+        for index in indices:
+            counts[index] += 1
+
+    compiled = [
+        (re.compile(pattern, re.MULTILINE), indices)
+        for pattern, indices in indices_by_pattern.items()
+    ]
+    return compiled, counts
 
 
 class LanguageDetector:
@@ -47,6 +93,26 @@ class LanguageDetector:
         ],
     }
 
+    # LANGUAGE_PATTERNS compiled once at class creation. A pattern shared by several
+    # languages (e.g. the react import) is searched once and scores for all of them.
+    _COMPILED_PATTERNS, _PATTERN_COUNTS = _compile_patterns(LANGUAGE_PATTERNS)
+
+    # Number of content-based detection results kept per detector
+    PATTERN_CACHE_SIZE = 1024
+
+    # Content-based detection only looks at the start of the code
+    DETECTION_CHARS = 4096
+
+    def __init__(self):
+        """Build the language -> extensions index from EXTENSION_MAP"""
+        extensions_by_language: dict[LanguageType, list[str]] = defaultdict(list)
+        for ext, lang in self.EXTENSION_MAP.items():
+            extensions_by_language[lang].append(ext)
+        self._extensions_by_language = dict(extensions_by_language)
+
+        # LRU cache of pattern detection results, keyed by a digest of the code
+        self._pattern_cache: "OrderedDict[bytes, LanguageType]" = OrderedDict()
+
     def detect_language(self, code: str, file_path: Optional[str] = None) -> LanguageType:
         """
         Detect the programming language from code content or file path.
@@ -64,33 +130,57 @@ class LanguageDetector:
             if lang != LanguageType.UNKNOWN:
                 return lang
 
-        # Fall back to pattern matching
-        return self._detect_by_patterns(code)
+        # Fall back to pattern matching, reusing the result for identical code
+        code = code[:self.DETECTION_CHARS]
+        key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+        lang = self._pattern_cache.get(key)
+        if lang is not None:
+            self._pattern_cache.move_to_end(key)
+            return lang
+
+        lang = self._detect_by_patterns(code)
+        self._pattern_cache[key] = lang
+        if len(self._pattern_cache) > self.PATTERN_CACHE_SIZE:
+            self._pattern_cache.popitem(last=False)
+        return lang
 
     def _detect_by_extension(self, file_path: str) -> LanguageType:
         """Detect language based on file extension"""
-        for ext, lang in self.EXTENSION_MAP.items():
-            if file_path.lower().endswith(ext):
-                return lang
-        return LanguageType.UNKNOWN
+        ext = os.path.splitext(file_path)[1].lower()
+        return self.EXTENSION_MAP.get(ext, LanguageType.UNKNOWN)
 
     def _detect_by_patterns(self, code: str) -> LanguageType:
         """Detect language based on code patterns"""
-        scores = {lang: 0 for lang in LanguageType if lang != LanguageType.UNKNOWN}
+        code = code[:self.DETECTION_CHARS]
+        # Scores and remaining pattern counts, indexed like _SCORED_LANGUAGES
+        scores = [0] * len(_SCORED_LANGUAGES)
+        remaining = list(self._PATTERN_COUNTS)
+        indices = range(len(scores))
 
-        for lang, patterns in self.LANGUAGE_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, code, re.MULTILINE):
-                    scores[lang] += 1
+        for pattern, pattern_indices in self._COMPILED_PATTERNS:
+            matched = pattern.search(code) is not None
+            for index in pattern_indices:
+                remaining[index] -= 1
+                scores[index] += matched
 
-        # Return language with highest score
-        if scores:
-            max_lang = max(scores.items(), key=lambda x: x[1])
-            if max_lang[1] > 0:
-                return max_lang[0]
+            # Stop once the leader cannot be caught even if every other
+            # language matched all of its remaining patterns
+            leader = max(indices, key=scores.__getitem__)
+            if all(
+                scores[leader] > scores[index] + remaining[index]
+                for index in indices
+                if index != leader
+            ):
+                return _SCORED_LANGUAGES[leader]
 
-        return LanguageType.UNKNOWN
+        # Return language with highest score
+        best = max(indices, key=scores.__getitem__)
+        return _SCORED_LANGUAGES[best] if scores[best] > 0 else LanguageType.UNKNOWN
 
     def get_supported_extensions(self, language: LanguageType) -> list[str]:
         """Get file extensions for a specific language"""
-        return [ext for ext, lang in self.EXTENSION_MAP.items() if lang == language]
+        return list(self._extensions_by_language.get(language, []))
+
+
+# Shared detector; its compiled patterns and result cache serve the whole process
+DETECTOR = LanguageDetector()
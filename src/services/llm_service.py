@@ -1,10 +1,117 @@
 import os
-import json
+import re
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
-from langchain_community.llms import LlamaCpp
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+import orjson
+from typing import Optional, Dict, Any, AsyncIterator, List, Sequence, Tuple, Union
+
+# Static request text is kept byte-identical across calls and precedes the code, which
+# is the only varying part, so the LLM server can reuse its KV cache for everything else
+SYSTEM_PROMPT = "You are a security code analysis expert. Analyze code for security vulnerabilities and return results as structured JSON."
+_CODE_HEADER = "\n\nProvide your analysis as a JSON array of security issues.\n\nCode to analyze:\n```\n"
+_CODE_FOOTER = "\n```"
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Lines that start a class, function or similar declaration; preferred chunk boundaries
+_RE_DECLARATION = re.compile(
+    r"[ \t]*(?:@\w+|(?:(?:export|default|public|private|protected|internal|static|abstract"
+    r"|final|sealed|partial|async)\s+)*(?:class|interface|enum|record|struct|function)\b"
+    r"|(?:export\s+)?(?:const|let)\s+[A-Z]\w*\s*[:=])"
+)
+
+# The issue array starts a line, optionally after a code fence; a "[" inside
+# prose, such as "String[] args", is not the issue array
+_RE_ARRAY_PREFIX = re.compile(r"[ \t]*(?:```(?:json)?[ \t]*)?")
+_RE_ARRAY_START = re.compile(r"^[ \t]*(?:```(?:json)?[ \t]*)?\[", re.MULTILINE)
+# Otherwise the first "[" that does not index or type an identifier
+_RE_ARRAY_INLINE = re.compile(r"(?<![\w\])])\[")
+
+
+class _JSONArrayScanner:
+    """Incrementally splits the first JSON array in a text stream into its top-level elements"""
+
+    def __init__(self):
+        self.closed = False  # the top-level array has been closed
+        self._depth = 0  # 0 = before the array, 1 = directly inside it
+        self._in_string = False
+        self._escaped = False
+        self._element: List[str] = []
+        self._line: List[str] = []  # start of the current line before the array
+
+    @property
+    def opened(self) -> bool:
+        """Whether the top-level array has been found"""
+        return self._depth > 0 or self.closed
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Consume the next piece of text.
+
+        Args:
+            text: Next chunk of LLM output
+
+        Returns:
+            Raw JSON strings of the elements completed by this chunk
+        """
+        elements = []
+        for char in text:
+            if self.closed:
+                break
+
+            if self._depth == 0:
+                # Skip any prose or code fence before the array
+                if char == "[" and _RE_ARRAY_PREFIX.fullmatch("".join(self._line)):
+                    self._depth = 1
+                elif char == "\n":
+                    self._line = []
+                elif len(self._line) < 16:
+                    # Longer prefixes cannot match, so the line need not be kept whole
+                    self._line.append(char)
+                continue
+
+            if self._in_string:
+                self._element.append(char)
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == "," and self._depth == 1:
+                self._flush(elements)
+                continue
+
+            if char in "]}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._flush(elements)
+                    self.closed = True
+                    continue
+            elif char in "[{":
+                self._depth += 1
+            elif char == '"':
+                self._in_string = True
+
+            self._element.append(char)
+
+        return elements
+
+    def _flush(self, elements: List[str]) -> None:
+        """Move the current element, if any, to elements"""
+        element = "".join(self._element).strip()
+        if element:
+            elements.append(element)
+        self._element = []
+
+
+class StreamOutcome:
+    """Completion state of a streamed analysis, filled in by stream_analyze_code"""
+
+    def __init__(self):
+        # The JSON array was closed and every element in it was parsed
+        self.complete = False
 
 
 class LLMService:
@@ -31,10 +138,50 @@ class LLMService:
         # Remove trailing slash from base_url
         self.base_url = self.base_url.rstrip("/")
 
+        # Request headers for the LMStudio API; the key is fixed per instance
+        self._headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+
+        # Shared HTTP client, created on first use so it binds to the serving event loop
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Longer code is split into chunks that are analyzed separately
+        self.max_code_chars = int(os.getenv("AEYEGUARD_MAX_CODE_CHARS", "16000"))
+
+        # Bounds the LLM requests in flight across all analyses, chunks included
+        self._request_slots = asyncio.Semaphore(int(os.getenv("MCP_LLM_CONCURRENCY", "8")))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared HTTP client, creating it if needed.
+
+        Reusing one client keeps connections to LMStudio alive between analyses.
+
+        Returns:
+            httpx.AsyncClient with the LMStudio headers set
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=120.0,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                headers=self._headers,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def analyze_code(self, code: str, prompt: str) -> str:
         """
         Analyze code using the LLM with a custom prompt.
 
+        The completion is streamed and cut off as soon as the JSON array of
+        issues is complete, instead of waiting for the LLM to finish.
+
         Args:
             code: Source code to analyze
             prompt: Analysis prompt with instructions
@@ -42,38 +189,210 @@ class LLMService:
         Returns:
             LLM response as string
         """
-        full_prompt = f"{prompt}\n\nCode to analyze:\n```\n{code}\n```\n\nProvide your analysis as a JSON array of security issues."
+        scanner = _JSONArrayScanner()
+        parts = []
+
+        try:
+            contents = self._stream_content(code, prompt)
+            try:
+                async for content in contents:
+                    parts.append(content)
+                    scanner.feed(content)
+                    if scanner.closed:
+                        break
+            finally:
+                # Closes the HTTP stream, which stops generation on a break
+                await contents.aclose()
+
+            return "".join(parts)
+
+        except Exception as e:
+            raise Exception(f"LLM analysis failed: {str(e)}")
+
+    async def analyze_many(
+        self, jobs: Sequence[Tuple[str, str]], concurrency: Optional[int] = None
+    ) -> List[Union[str, Exception]]:
+        """
+        Analyze several code samples concurrently.
+
+        Requests always share the service-wide MCP_LLM_CONCURRENCY limit.
+
+        Args:
+            jobs: (code, prompt) pairs to analyze
+            concurrency: Optional lower limit on this call's requests in flight
+
+        Returns:
+            LLM responses in job order; a failed job yields its exception instead
+        """
+        if concurrency is None:
+            return await asyncio.gather(
+                *(self.analyze_code(code, prompt) for code, prompt in jobs), return_exceptions=True
+            )
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(code: str, prompt: str) -> str:
+            async with semaphore:
+                return await self.analyze_code(code, prompt)
+
+        return await asyncio.gather(
+            *(run(code, prompt) for code, prompt in jobs), return_exceptions=True
+        )
+
+    def split_code(self, code: str) -> List[Tuple[int, str]]:
+        """
+        Split code longer than max_code_chars into chunks for separate analysis.
+
+        Chunks end on whole lines, preferably before a class or function
+        declaration, so each chunk stays meaningful to the LLM.
+
+        Args:
+            code: Source code to split
+
+        Returns:
+            (line offset, chunk) pairs; the offset is the number of lines before the chunk
+        """
+        if self.max_code_chars <= 0 or len(code) <= self.max_code_chars:
+            return [(0, code)]
+
+        lines = code.split("\n")
+        chunks = []
+        start = 0  # first line of the current chunk
+        size = 0  # characters in lines[start:index], newlines included
+        cut = None  # last declaration line inside the current chunk
+
+        for index, line in enumerate(lines):
+            if index > start and size + len(line) > self.max_code_chars:
+                end = cut if cut is not None else index
+                chunks.append((start, "\n".join(lines[start:end])))
+                size -= sum(len(kept) + 1 for kept in lines[start:end])
+                start, cut = end, None
+            if index > start and _RE_DECLARATION.match(line):
+                cut = index
+            size += len(line) + 1
+
+        chunks.append((start, "\n".join(lines[start:])))
+        return chunks
+
+    async def stream_analyze_code(
+        self, code: str, prompt: str, outcome: Optional[StreamOutcome] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze code using the LLM, yielding issues as soon as the LLM completes them.
+
+        Args:
+            code: Source code to analyze
+            prompt: Analysis prompt with instructions
+            outcome: Optional StreamOutcome, marked complete once the whole JSON
+                array has been read without skipping any element
+
+        Yields:
+            Issue dictionaries in the order the LLM reports them
+        """
+        scanner = _JSONArrayScanner()
+        skipped = False
+        parts = []
 
         try:
-            # Use LMStudio's OpenAI-compatible API
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/v1/chat/completions",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a security code analysis expert. Analyze code for security vulnerabilities and return results as structured JSON.",
-                            },
-                            {"role": "user", "content": full_prompt},
-                        ],
-                        "temperature": 0.3,
-                        "max_tokens": 2000,
-                    },
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}" if self.api_key else "",
-                        "Content-Type": "application/json",
-                    },
-                )
-                response.raise_for_status()
-
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+            contents = self._stream_content(code, prompt)
+            try:
+                async for content in contents:
+                    parts.append(content)
+                    for element in scanner.feed(content):
+                        try:
+                            issue = orjson.loads(element)
+                        except orjson.JSONDecodeError:
+                            # Skip malformed issues
+                            skipped = True
+                            continue
+                        if isinstance(issue, dict):
+                            yield issue
+                        else:
+                            skipped = True
+
+                    if scanner.closed:
+                        break
+            finally:
+                await contents.aclose()
+
+            if not scanner.opened:
+                # No array started a line; fall back to parsing the whole reply
+                issues = self.try_parse_llm_response("".join(parts))
+                for issue in issues or []:
+                    if isinstance(issue, dict):
+                        yield issue
+                    else:
+                        skipped = True
+                complete = issues is not None
+            else:
+                complete = scanner.closed
+
+            # Prose-only, truncated or partly malformed output is not a complete result
+            if outcome is not None:
+                outcome.complete = complete and not skipped
 
         except Exception as e:
             raise Exception(f"LLM analysis failed: {str(e)}")
 
+    async def _stream_content(self, code: str, prompt: str) -> AsyncIterator[str]:
+        """
+        Request a streamed chat completion and yield the text as it is generated.
+
+        Args:
+            code: Source code to analyze
+            prompt: Analysis prompt with instructions
+
+        Yields:
+            Chunks of the completion text
+        """
+        # Use LMStudio's OpenAI-compatible API; the slot is held until the stream closes
+        async with self._request_slots, self._get_client().stream(
+            "POST",
+            f"{self.base_url}/v1/chat/completions",
+            content=orjson.dumps(self._build_payload(code, prompt)),
+        ) as response:
+            response.raise_for_status()
+
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                # The server ignored "stream" and sent the whole completion at once
+                result = orjson.loads(await response.aread())
+                yield result["choices"][0]["message"]["content"]
+                return
+
+            # Server-sent events: one "data: {...}" line per generated chunk
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                choices = orjson.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+
+    def _build_payload(self, code: str, prompt: str) -> Dict[str, Any]:
+        """
+        Build the streamed chat completion request body for an analysis.
+
+        Args:
+            code: Source code to analyze
+            prompt: Analysis prompt with instructions
+
+        Returns:
+            JSON-serializable request body
+        """
+        full_prompt = f"{prompt}{_CODE_HEADER}{code}{_CODE_FOOTER}"
+
+        return {
+            "model": self.model,
+            "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": full_prompt}],
+            "temperature": 0.3,
+            "max_tokens": 2000,
+            "stream": True,
+        }
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Check if LLM service is available and healthy.
@@ -82,17 +401,16 @@ class LLMService:
             Dictionary with health status information
         """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/v1/models")
-                response.raise_for_status()
-
-                models = response.json()
-                return {
-                    "status": "healthy",
-                    "available": True,
-                    "models": models.get("data", []),
-                    "base_url": self.base_url,
-                }
+            response = await self._get_client().get(f"{self.base_url}/v1/models", timeout=5.0)
+            response.raise_for_status()
+
+            models = orjson.loads(response.content)
+            return {
+                "status": "healthy",
+                "available": True,
+                "models": models.get("data", []),
+                "base_url": self.base_url,
+            }
         except Exception as e:
             return {
                 "status": "unhealthy",
@@ -111,21 +429,34 @@ class LLMService:
         Returns:
             List of issue dictionaries
         """
+        issues = self.try_parse_llm_response(response)
+        # If parsing fails, return empty list
+        return issues if issues is not None else []
+
+    def try_parse_llm_response(self, response: str) -> Optional[list[Dict[str, Any]]]:
+        """
+        Parse LLM response, telling an unparseable response apart from an empty one.
+
+        Args:
+            response: Raw LLM response
+
+        Returns:
+            List of issue dictionaries, or None if the response holds no JSON array
+        """
         try:
             # Try to find JSON in the response
-            # LLMs often wrap JSON in code blocks
-            json_start = response.find("[")
+            # LLMs often wrap JSON in code blocks; prefer an array that starts a line
+            match = _RE_ARRAY_START.search(response) or _RE_ARRAY_INLINE.search(response)
+            json_start = match.end() - 1 if match else -1
             json_end = response.rfind("]") + 1
 
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                issues = json.loads(json_str)
-                return issues if isinstance(issues, list) else []
+            # Without a "[" ... "]" span the response cannot hold a JSON array,
+            # so there is no point in parsing the whole text
+            if json_start < 0 or json_end <= json_start:
+                return None
 
-            # If no array found, try to parse entire response
-            issues = json.loads(response)
-            return issues if isinstance(issues, list) else []
+            issues = orjson.loads(response[json_start:json_end])
+            return issues if isinstance(issues, list) else None
 
-        except json.JSONDecodeError:
-            # If parsing fails, return empty list
-            return []
+        except orjson.JSONDecodeError:
+            return None
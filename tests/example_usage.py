@@ -8,7 +8,7 @@ for testing and development purposes.
 
 import asyncio
 from src.models import AnalysisRequest
-from src.services import LanguageDetector, LLMService
+from src.services import DETECTOR, LLMService
 from src.analyzers import CSharpSecurityAnalyzer, ReactTypeScriptAnalyzer
 
 
@@ -159,7 +159,7 @@ async def example_language_detection():
     print("=" * 60)
     print()
 
-    detector = LanguageDetector()
+    detector = DETECTOR
 
     test_cases = [
         ("UserController.cs", "namespace MyApp { public class User { } }"),
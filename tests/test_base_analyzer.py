@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Test shared BaseSecurityAnalyzer behaviour without a running LMStudio
+"""
+
+import sys
+import os
+import json
+import asyncio
+import httpx
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzers import (
+    CSharpSecurityAnalyzer,
+    JavaSecurityAnalyzer,
+    ReactJavaScriptAnalyzer,
+    ReactTypeScriptAnalyzer,
+)
+from src.services import LLMService
+
+
+class FakeLLMService(LLMService):
+    """LLMService that returns a canned response and counts calls"""
+
+    def __init__(self, response: str = "[]"):
+        super().__init__(base_url="http://localhost:1")
+        self.response = response
+        self.calls = 0
+
+    async def analyze_code(self, code: str, prompt: str) -> str:
+        self.calls += 1
+        return self.response
+
+    async def stream_analyze_code(self, code: str, prompt: str, outcome=None):
+        self.calls += 1
+        issues = self.try_parse_llm_response(self.response)
+        for issue in issues or []:
+            yield issue
+        if outcome is not None:
+            outcome.complete = issues is not None
+
+
+SQL_ISSUE_RESPONSE = """```json
+[
+  {
+    "id": "JAVA-001",
+    "title": "SQL Injection",
+    "description": "Query built with string concatenation",
+    "severity": "critical",
+    "line_number": 3
+  }
+]
+```"""
+
+JAVA_CODE = """
+public class Users {
+    String sql = "SELECT * FROM users WHERE id = '" + id + "'";
+}
+"""
+
+
+def test_preprocess_preserves_lines():
+    """Test that comment removal keeps line numbers stable"""
+    print("Testing comment preprocessing...")
+
+    analyzer = JavaSecurityAnalyzer(FakeLLMService())
+    code = "int a; // trailing\n/* one\n   two */ int b;\n/** doc */\nint c; /* x */ int d;\n"
+
+    preprocessed = analyzer.preprocess_code(code)
+    assert preprocessed == "int a; \n\n int b;\n\nint c;  int d;\n", repr(preprocessed)
+    assert preprocessed.count("\n") == code.count("\n")
+    print("✓ Comments removed and line count preserved")
+
+
+def test_analysis_cache():
+    """Test that identical code is only sent to the LLM once"""
+    print("\nTesting analysis cache...")
+
+    llm_service = FakeLLMService(SQL_ISSUE_RESPONSE)
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    first = asyncio.run(analyzer.analyze(JAVA_CODE, "Users.java"))
+    second = asyncio.run(analyzer.analyze(JAVA_CODE, "Other.java"))
+
+    assert llm_service.calls == 1, f"Expected 1 LLM call, got {llm_service.calls}"
+    assert first.analysis_metadata["cache_hit"] is False
+    assert second.analysis_metadata["cache_hit"] is True
+    assert second.issues[0].file_path == "Other.java"
+    assert first.issues[0].file_path == "Users.java"
+    assert second.issues[0].id == first.issues[0].id
+    cached_issue = next(iter(analyzer._cache.values()))[0]
+    assert cached_issue.file_path is None, "Cached issues must not keep a request's file path"
+    assert second.issues[0].severity == "CRITICAL"
+    assert second.analysis_metadata["critical_count"] == 1
+    assert "1 critical" in second.summary
+    print("✓ Repeated analysis is served from the cache")
+
+    asyncio.run(analyzer.analyze(JAVA_CODE + "\nclass Extra {}", "Users.java"))
+    assert llm_service.calls == 2, "Changed code should miss the cache"
+    print("✓ Changed code is sent to the LLM")
+
+
+def test_analysis_cache_eviction():
+    """Test that the cache is bounded by AEYEGUARD_CACHE_SIZE"""
+    print("\nTesting analysis cache eviction...")
+
+    llm_service = FakeLLMService()
+    analyzer = JavaSecurityAnalyzer(llm_service)
+    analyzer._cache_size = 2
+
+    for name in ("A", "B", "C"):
+        asyncio.run(analyzer.analyze(f"class {name} {{}}"))
+    assert len(analyzer._cache) == 2
+
+    asyncio.run(analyzer.analyze("class A {}"))
+    assert llm_service.calls == 4, "Least recently used entry should have been evicted"
+    print("✓ Least recently used entries are evicted")
+
+
+def test_analysis_cache_scope():
+    """Test that the cache key covers the model and only parseable responses are cached"""
+    print("\nTesting analysis cache scope...")
+
+    llm_service = FakeLLMService("The model is still loading")
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    async def stream():
+        return [issue async for issue in analyzer.analyze_stream(JAVA_CODE)]
+
+    asyncio.run(analyzer.analyze(JAVA_CODE))
+    asyncio.run(analyzer.analyze(JAVA_CODE))
+    assert llm_service.calls == 2, "Unparseable responses must not be cached"
+    asyncio.run(stream())
+    asyncio.run(stream())
+    assert llm_service.calls == 4 and not analyzer._cache, "Unparseable streams must not be cached"
+    print("✓ Unparseable responses are not cached, streamed or not")
+
+    llm_service.response = SQL_ISSUE_RESPONSE
+    asyncio.run(analyzer.analyze(JAVA_CODE))
+    llm_service.model = "another-model"
+    result = asyncio.run(analyzer.analyze(JAVA_CODE))
+    assert llm_service.calls == 6 and result.analysis_metadata["cache_hit"] is False
+    print("✓ Changing the model misses the cache")
+
+
+def test_long_code_chunked():
+    """Test that long code is analyzed in chunks with absolute line numbers"""
+    print("\nTesting chunked analysis of long code...")
+
+    llm_service = FakeLLMService(SQL_ISSUE_RESPONSE)
+    llm_service.max_code_chars = 200
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    code = "\n".join(JAVA_CODE for _ in range(5))
+    chunks = llm_service.split_code(code)
+    result = asyncio.run(analyzer.analyze(code, "Users.java"))
+
+    assert llm_service.calls == len(chunks) > 1
+    assert [issue.line_number for issue in result.issues] == [3 + offset for offset, _ in chunks]
+    print("✓ Chunk issues are merged with line numbers in the full code")
+
+
+def test_analyze_stream():
+    """Test that streamed issues are yielded and cached"""
+    print("\nTesting streaming analysis...")
+
+    llm_service = FakeLLMService(SQL_ISSUE_RESPONSE)
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    async def collect():
+        return [issue async for issue in analyzer.analyze_stream(JAVA_CODE, "Users.java")]
+
+    issues = asyncio.run(collect())
+    assert [issue.id for issue in issues] == ["JAVA-001"]
+    assert issues[0].file_path == "Users.java"
+
+    result = asyncio.run(analyzer.analyze(JAVA_CODE, "Users.java"))
+    assert llm_service.calls == 1, "Completed stream should populate the cache"
+    assert result.analysis_metadata["cache_hit"] is True
+    print("✓ Streamed issues are yielded and cached")
+
+
+def _sse_llm_service(text: str) -> LLMService:
+    """LLMService whose LMStudio streams text as server-sent events and counts requests"""
+    llm_service = LLMService(base_url="http://lmstudio.test")
+    llm_service.calls = 0
+    events = "".join(
+        f"data: {json.dumps({'choices': [{'delta': {'content': text[start:start + 20]}}]})}\n\n"
+        for start in range(0, len(text), 20)
+    ) + "data: [DONE]\n\n"
+
+    def handler(request):
+        llm_service.calls += 1
+        return httpx.Response(200, text=events, headers={"content-type": "text/event-stream"})
+
+    llm_service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return llm_service
+
+
+def test_incomplete_stream_not_cached():
+    """Test that streams without a whole, parseable JSON array are not cached"""
+    print("\nTesting caching of incomplete streams...")
+
+    replies = {
+        "prose only": "The model could not analyze this code.",
+        "truncated": '```json\n[\n  {"id": "JAVA-001", "title": "SQL Injection"},\n  {"id": "JAVA-0',
+        "malformed element": '[{"id": "JAVA-001"}, {"id": oops}]',
+    }
+    for name, reply in replies.items():
+        llm_service = _sse_llm_service(reply)
+        analyzer = JavaSecurityAnalyzer(llm_service)
+
+        async def run():
+            streamed = [issue async for issue in analyzer.analyze_stream(JAVA_CODE)]
+            result = await analyzer.analyze(JAVA_CODE)
+            return streamed, result
+
+        streamed, result = asyncio.run(run())
+        assert len(analyzer._cache) == 0, f"{name}: incomplete stream was cached"
+        assert llm_service.calls == 2 and result.analysis_metadata["cache_hit"] is False, name
+        print(f"✓ {name.capitalize()} reply ({len(streamed)} streamed issues) is not cached")
+
+    # An array that does not start a line is parsed from the whole reply instead
+    llm_service = _sse_llm_service('Found in String[] args: [{"id": "JAVA-001"}]')
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    async def stream():
+        return [issue async for issue in analyzer.analyze_stream(JAVA_CODE)]
+
+    assert [issue.id for issue in asyncio.run(stream())] == ["JAVA-001"]
+    assert len(analyzer._cache) == 1
+    print("✓ Inline arrays are parsed from the whole reply and cached")
+
+
+def test_llm_skipped_without_sinks():
+    """Test that blank code, and sink-free code with the prefilter on, skip the LLM"""
+    print("\nTesting LLM skipping...")
+
+    llm_service = FakeLLMService(SQL_ISSUE_RESPONSE)
+    analyzer = JavaSecurityAnalyzer(llm_service)
+
+    result = asyncio.run(analyzer.analyze("  \n// only a comment\n"))
+    assert llm_service.calls == 0 and result.issues == []
+    assert result.analysis_metadata["llm_skipped"] is True
+    print("✓ Blank code is not sent to the LLM")
+
+    plain_code = "public class Point {\n    int x;\n    int y;\n}\n"
+    asyncio.run(analyzer.analyze(plain_code))
+    assert llm_service.calls == 1, "Prefilter must be opt-in"
+
+    analyzer._sink_prefilter = True
+    analyzer._cache.clear()
+    result = asyncio.run(analyzer.analyze(plain_code))
+    assert llm_service.calls == 1 and result.analysis_metadata["llm_skipped"] is True
+    asyncio.run(analyzer.analyze(JAVA_CODE))
+    assert llm_service.calls == 2, "Code with sinks must still reach the LLM"
+    print("✓ Sink prefilter skips only code without sinks")
+
+
+# Per analyzer: sink-free code full of words that contain sink fragments
+# (describe/DES, Author/auth, format/form, catalog/log, Profile/File), and a real sink
+SINK_SAMPLES = {
+    JavaSecurityAnalyzer: (
+        "public class Author {\n    private Profile profile;\n"
+        "    String describe() { return format(date); }\n"
+        "    int catalogSize() { return catalog.size(); }\n}\n"
+        "class AuthorNotFoundException extends RuntimeException {}\n",
+        "Runtime.getRuntime().exec(cmd);",
+    ),
+    CSharpSecurityAnalyzer: (
+        "public class Author\n{\n    public Profile Profile { get; set; }\n"
+        "    public string Describe() => Format(Date);\n"
+        "    public int CatalogSize() => catalog.Count;\n}\n"
+        "public class AuthorNotFoundException : Exception {}\n",
+        "var cmd = new SqlCommand(query, conn);",
+    ),
+    ReactJavaScriptAnalyzer: (
+        "export function AuthorCard({ author, profile }) {\n"
+        "  const formatted = format(author.date);\n"
+        "  return <Profile formatter={formatted} description={describe(author)} />;\n}\n",
+        "<div dangerouslySetInnerHTML={{ __html: html }} />",
+    ),
+    ReactTypeScriptAnalyzer: (
+        "export function AuthorCard({ author, profile }: Props) {\n"
+        "  const formatted: string = format(author.date);\n"
+        "  return <Profile formatter={formatted} description={describe(author)} />;\n}\n",
+        "const data = payload as any;",
+    ),
+}
+
+
+def test_sink_prefilter_word_boundaries():
+    """Test that sink patterns match whole identifiers, not fragments of common words"""
+    print("\nTesting sink pattern word boundaries...")
+
+    for analyzer_class, (plain_code, sink_code) in SINK_SAMPLES.items():
+        analyzer = analyzer_class(FakeLLMService())
+        analyzer._sink_prefilter = True
+
+        match = analyzer.SINK_PATTERN.search(plain_code)
+        assert match is None, f"{analyzer_class.__name__} matched {match.group()!r}"
+        assert analyzer._can_skip_llm(plain_code)
+        assert not analyzer._can_skip_llm(sink_code), f"{analyzer_class.__name__} missed {sink_code!r}"
+    print("✓ Sink-free code with common words is skipped, real sinks are not")
+
+
+def test_fallback_issue_ids():
+    """Test that issues without an id get distinct generated ids"""
+    print("\nTesting fallback issue ids...")
+
+    analyzer = JavaSecurityAnalyzer(FakeLLMService())
+    issues = analyzer._create_security_issues(
+        [{"title": "A"}, {"id": "JAVA-002"}, {"title": "C"}]
+    )
+
+    assert [issue.id for issue in issues][1] == "JAVA-002"
+    generated = [issues[0].id, issues[2].id]
+    assert all(id.startswith("SEC-") and len(id) == 12 for id in generated), generated
+    assert generated[0] != generated[1]
+    print("✓ Missing ids are generated and unique")
+
+
+def test_malformed_issues_skipped():
+    """Test that malformed LLM issues are dropped without losing valid ones"""
+    print("\nTesting malformed issue handling...")
+
+    analyzer = JavaSecurityAnalyzer(FakeLLMService())
+    issues = analyzer._create_security_issues(
+        [{"id": "A"}, "not an issue", {"id": "B", "line_number": "line three"}, {"id": "C"}]
+    )
+
+    assert [issue.id for issue in issues] == ["A", "C"], issues
+    print("✓ Malformed issues are skipped")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Base Analyzer Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        test_preprocess_preserves_lines()
+        test_analysis_cache()
+        test_analysis_cache_eviction()
+        test_analysis_cache_scope()
+        test_long_code_chunked()
+        test_analyze_stream()
+        test_incomplete_stream_not_cached()
+        test_llm_skipped_without_sinks()
+        test_sink_prefilter_word_boundaries()
+        test_fallback_issue_ids()
+        test_malformed_issues_skipped()
+
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print(f"✗ Test failed: {e}")
+        print("=" * 60)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
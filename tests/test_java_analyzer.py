@@ -5,19 +5,92 @@ Test Java analyzer implementation
 
 import sys
 import os
+import re
+import functools
+import importlib.util
+from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.models import LanguageType
-from src.services import LanguageDetector
+# Rules the Java security prompt must cover
+EXPECTED_RULES = {
+    "SQL Injection",
+    "Command Injection",
+    "XXE",
+    "JNDI Injection",
+    "Hardcoded Credentials",
+}
+_RULE_RE = re.compile("|".join(map(re.escape, EXPECTED_RULES)))
+
+JAVA_CODE = """
+package com.example.service;
+
+import java.util.List;
+import javax.persistence.Entity;
+
+@Entity
+public class User {
+    private String username;
+    private String password;
+
+    public String getUsername() {
+        return username;
+    }
+}
+"""
+
+JAVA_CODE_WITH_COMMENTS = """
+package com.example;
+
+// This is a single-line comment
+/* This is a
+   multi-line comment */
+
+public class Test {
+    /** Javadoc comment */
+    public void method() {
+        String sql = "SELECT * FROM users";
+    }
+}
+"""
+
+# Substrings that preprocessing must remove (False) or keep (True)
+PREPROCESS_CHECKS = (
+    ("// This is a single-line comment", False),
+    ("/* This is a", False),
+    ("public class Test", True),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _detector():
+    """Language detector shared by the tests"""
+    from src.services import LanguageDetector
+    return LanguageDetector()
+
+
+@functools.lru_cache(maxsize=1)
+def _analyzer():
+    """Java analyzer shared by the tests"""
+    from src.analyzers import JavaSecurityAnalyzer
+    from src.services import LLMService
+    return JavaSecurityAnalyzer(LLMService())
+
+
+@functools.lru_cache(maxsize=8)
+def _preprocess(code: str) -> str:
+    """Preprocess code with the shared analyzer"""
+    return _analyzer().preprocess_code(code)
 
 
 def test_java_language_detection():
     """Test Java language detection"""
     print("Testing Java language detection...")
 
-    detector = LanguageDetector()
+    from src.models import LanguageType
+
+    detector = _detector()
 
     # Test extension-based detection
     java_file = "UserService.java"
@@ -26,27 +99,15 @@ def test_java_language_detection():
     print("✓ Extension-based detection works")
 
     # Test pattern-based detection
-    java_code = """
-    package com.example.service;
-
-    import java.util.List;
-    import javax.persistence.Entity;
-
-    @Entity
-    public class User {
-        private String username;
-        private String password;
-
-        public String getUsername() {
-            return username;
-        }
-    }
-    """
-
-    detected = detector._detect_by_patterns(java_code)
+    detected = detector._detect_by_patterns(JAVA_CODE)
     assert detected == LanguageType.JAVA, f"Expected JAVA, got {detected}"
     print("✓ Pattern-based detection works")
 
+    for _ in range(2):
+        assert detector.detect_language(JAVA_CODE) == LanguageType.JAVA
+    assert len(detector._pattern_cache) == 1
+    print("✓ Pattern-based detection results are cached")
+
     # Test supported extensions
     extensions = detector.get_supported_extensions(LanguageType.JAVA)
     assert ".java" in extensions, f"Expected .java in {extensions}"
@@ -58,12 +119,10 @@ def test_java_analyzer_import():
     print("\nTesting Java analyzer import...")
 
     try:
-        from src.analyzers import JavaSecurityAnalyzer
-        from src.services import LLMService
+        from src.models import LanguageType
 
         # Create analyzer instance
-        llm_service = LLMService()
-        analyzer = JavaSecurityAnalyzer(llm_service)
+        analyzer = _analyzer()
 
         # Verify language type
         assert analyzer.get_language_type() == LanguageType.JAVA
@@ -73,33 +132,15 @@ def test_java_analyzer_import():
         # Verify security rules prompt exists
         prompt = analyzer.get_security_rules_prompt()
         assert len(prompt) > 0, "Security rules prompt is empty"
-        assert "SQL Injection" in prompt, "SQL Injection rule not found in prompt"
-        assert "Command Injection" in prompt, "Command Injection rule not found"
-        assert "XXE" in prompt, "XXE rule not found"
-        assert "JNDI Injection" in prompt, "JNDI Injection rule not found"
-        assert "Hardcoded Credentials" in prompt, "Hardcoded Credentials rule not found"
+        missing = EXPECTED_RULES - set(_RULE_RE.findall(prompt))
+        assert not missing, f"Rules not found in prompt: {sorted(missing)}"
         print("✓ Security rules prompt contains expected rules")
 
         # Test preprocessing
-        java_code_with_comments = """
-        package com.example;
-
-        // This is a single-line comment
-        /* This is a
-           multi-line comment */
-
-        public class Test {
-            /** Javadoc comment */
-            public void method() {
-                String sql = "SELECT * FROM users";
-            }
-        }
-        """
-
-        preprocessed = analyzer.preprocess_code(java_code_with_comments)
-        assert "// This is a single-line comment" not in preprocessed
-        assert "/* This is a" not in preprocessed
-        assert "public class Test" in preprocessed
+        preprocessed = _preprocess(JAVA_CODE_WITH_COMMENTS)
+        for pattern, should_be_present in PREPROCESS_CHECKS:
+            present = pattern in preprocessed
+            assert present == should_be_present, f"{pattern!r}: expected present={should_be_present}"
         print("✓ Code preprocessing removes comments correctly")
 
     except ImportError as e:
@@ -111,6 +152,18 @@ def test_java_in_mcp_service():
     """Test that Java is registered in MCP service"""
     print("\nTesting Java analyzer registration in MCP service...")
 
+    # Check the wiring in the service source without executing it
+    spec = importlib.util.find_spec("src.AeyeGuard_mcp")
+    assert spec is not None, "MCP service module not found"
+    source = Path(spec.origin).read_text(encoding="utf-8")
+    assert "LanguageType.JAVA: JavaSecurityAnalyzer(" in source, "JavaSecurityAnalyzer not registered in MCP service"
+    print("✓ JavaSecurityAnalyzer is registered in MCP service source")
+
+    # Importing the service sets up the LLM layer, so it only runs on request
+    if not os.environ.get("AEYEGUARD_LIVE_TESTS"):
+        print("  Import check skipped (set AEYEGUARD_LIVE_TESTS=1 to enable)")
+        return
+
     try:
         from src.AeyeGuard_mcp import SecurityAnalyzerMCP
         from src.models import LanguageType
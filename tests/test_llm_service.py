@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test LLMService response handling without a running LMStudio
+"""
+
+import sys
+import os
+import json
+import asyncio
+import httpx
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import LLMService
+from src.services.llm_service import _JSONArrayScanner
+
+
+STREAMED_RESPONSE = """Here are the issues:
+```json
+[
+  {"id": "A", "title": "Brackets [in] {strings}", "description": "Escaped \\" quote, comma"},
+  {"id": "B", "references": ["CWE-89", "OWASP-A03"]}
+]
+```
+Trailing text [ignored]"""
+
+
+def test_parse_llm_response():
+    """Test extraction of the JSON array from an LLM response"""
+    print("Testing LLM response parsing...")
+
+    llm_service = LLMService(base_url="http://localhost:1")
+
+    issues = llm_service.parse_llm_response('```json\n[{"id": "A"}]\n```')
+    assert issues == [{"id": "A"}], issues
+    assert llm_service.parse_llm_response("no issues here") == []
+    assert llm_service.parse_llm_response("[not json]") == []
+    print("✓ JSON arrays are extracted and invalid responses yield no issues")
+
+    assert llm_service.try_parse_llm_response("[]") == []
+    assert llm_service.try_parse_llm_response("[not json]") is None
+    assert llm_service.try_parse_llm_response("] no array [") is None
+    print("✓ Unparseable responses are distinguishable from empty ones")
+
+
+def test_json_array_scanner():
+    """Test that streamed text is split into complete array elements"""
+    print("\nTesting streaming JSON array scanner...")
+
+    for chunk_size in (1, 5, len(STREAMED_RESPONSE)):
+        scanner = _JSONArrayScanner()
+        elements = []
+        for start in range(0, len(STREAMED_RESPONSE), chunk_size):
+            elements += scanner.feed(STREAMED_RESPONSE[start:start + chunk_size])
+
+        issues = [json.loads(element) for element in elements]
+        assert [issue["id"] for issue in issues] == ["A", "B"], issues
+        assert issues[0]["title"] == "Brackets [in] {strings}"
+        assert scanner.closed
+    print("✓ Elements are emitted regardless of chunk boundaries")
+
+    scanner = _JSONArrayScanner()
+    assert scanner.feed("[]") == [] and scanner.closed
+    print("✓ Empty arrays close the stream")
+
+    scanner = _JSONArrayScanner()
+    assert scanner.feed("Uses String[] args and x[0].\n```json [1, 2]") == ["1", "2"]
+    assert scanner.closed
+    print("✓ Brackets inside prose do not open the array")
+
+
+def test_shared_client():
+    """Test that requests reuse one HTTP client until it is closed"""
+    print("\nTesting shared HTTP client...")
+
+    llm_service = LLMService(base_url="http://lmstudio.test")
+    content = '[{"id": "A"}]'
+
+    async def run():
+        # Serve requests in-process instead of from LMStudio
+        client = llm_service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, json={"choices": [{"message": {"content": content}}]}
+                )
+            )
+        )
+        for _ in range(2):
+            assert await llm_service.analyze_code("class A {}", "prompt") == content
+        assert llm_service._get_client() is client
+        await llm_service.aclose()
+        assert client.is_closed and llm_service._client is None
+
+    asyncio.run(run())
+    print("✓ One client serves all requests and is closed by aclose()")
+
+
+def test_analyze_code_stops_at_array_end():
+    """Test that analyze_code stops reading once the issue array is complete"""
+    print("\nTesting early end of streamed analysis...")
+
+    chunks = ['Issues:\n[{"id": "A"}', ', {"id": "B"}]', "\nSome closing remarks"]
+    llm_service = LLMService(base_url="http://lmstudio.test")
+
+    async def run(chunks):
+        events = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n"
+            for chunk in chunks
+        ) + "data: [DONE]\n\n"
+        llm_service._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200, text=events, headers={"content-type": "text/event-stream"}
+                )
+            )
+        )
+        response = await llm_service.analyze_code("class A {}", "prompt")
+        await llm_service.aclose()
+        return response
+
+    response = asyncio.run(run(chunks))
+    assert response == 'Issues:\n[{"id": "A"}, {"id": "B"}]', repr(response)
+    assert llm_service.parse_llm_response(response) == [{"id": "A"}, {"id": "B"}]
+    print("✓ Streamed completion is cut off after the closing bracket")
+
+    chunks = [
+        "The `main(String[] args)` method builds SQL from input.\n",
+        '```json\n[{"id": "JAVA-001", "severity": "CRITICAL"}]\n```',
+        "\nSome closing remarks",
+    ]
+    response = asyncio.run(run(chunks))
+    assert "closing remarks" not in response, repr(response)
+    assert llm_service.try_parse_llm_response(response) == [{"id": "JAVA-001", "severity": "CRITICAL"}]
+    print("✓ Array syntax in prose before the JSON does not end the completion")
+
+
+def test_analyze_many():
+    """Test that analyze_many runs jobs concurrently, bounded and in order"""
+    print("\nTesting concurrent analyses...")
+
+    class SlowLLMService(LLMService):
+        in_flight = 0
+        peak = 0
+
+        async def analyze_code(self, code: str, prompt: str) -> str:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            if code == "bad":
+                raise Exception("LLM analysis failed: boom")
+            return code.upper()
+
+    llm_service = SlowLLMService(base_url="http://localhost:1")
+    jobs = [("a", "p"), ("bad", "p"), ("c", "p"), ("d", "p")]
+    results = asyncio.run(llm_service.analyze_many(jobs, concurrency=2))
+
+    assert results[0] == "A" and results[2:] == ["C", "D"], results
+    assert isinstance(results[1], Exception)
+    assert llm_service.peak == 2, llm_service.peak
+    print("✓ Jobs run concurrently up to the limit and failures are returned in place")
+
+
+def test_split_code():
+    """Test that long code is split on declarations with correct line offsets"""
+    print("\nTesting long code splitting...")
+
+    llm_service = LLMService(base_url="http://localhost:1")
+    llm_service.max_code_chars = 120
+
+    lines = ["public class A {", "  void f() { call(); }", "}", ""]
+    lines += ["public class B {"] + [f"  int field{i};" for i in range(20)] + ["}"]
+    code = "\n".join(lines)
+
+    chunks = llm_service.split_code(code)
+    assert len(chunks) > 1
+    assert "\n".join(chunk for _, chunk in chunks) == code
+    assert all(len(chunk) <= 120 for _, chunk in chunks)
+    assert all(chunk.split("\n")[0] == lines[offset] for offset, chunk in chunks)
+    assert chunks[1] == (4, chunks[1][1]), "Should cut before the class declaration"
+    print("✓ Chunks cover the code, respect the limit and start at declarations")
+
+    assert llm_service.split_code("class A {}") == [(0, "class A {}")]
+    print("✓ Short code is not split")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("LLM Service Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        test_parse_llm_response()
+        test_json_array_scanner()
+        test_shared_client()
+        test_analyze_code_stops_at_array_end()
+        test_analyze_many()
+        test_split_code()
+
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print(f"✗ Test failed: {e}")
+        print("=" * 60)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test SecurityAnalyzerMCP request handling without a running LMStudio
+"""
+
+import sys
+import os
+import asyncio
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import HTTPException
+
+from src.AeyeGuard_mcp import SecurityAnalyzerMCP
+from src.models import AnalysisRequest, LanguageType
+
+
+class FakeLMStudio:
+    """Mock LMStudio chat endpoint that answers "[]" and tracks requests in flight"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.calls = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return httpx.Response(200, json={"choices": [{"message": {"content": "[]"}}]})
+
+
+def _make_service(env: dict, lmstudio: FakeLMStudio) -> SecurityAnalyzerMCP:
+    """Create a service with the given settings, talking to a fake LMStudio"""
+    saved = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    try:
+        service = SecurityAnalyzerMCP()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    service.llm_service._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lmstudio.handler)
+    )
+    return service
+
+
+def _java_code(name: str, classes: int) -> str:
+    """Java source with one SQL-building class per chunk-sized block"""
+    return "\n".join(
+        f'public class {name}{index} {{\n    String sql = "SELECT * FROM t WHERE id = " + id;\n}}'
+        for index in range(classes)
+    )
+
+
+def test_llm_concurrency_limit():
+    """Test that MCP_LLM_CONCURRENCY bounds LLM requests, chunks of long code included"""
+    print("Testing LLM concurrency limit...")
+
+    lmstudio = FakeLMStudio()
+    service = _make_service(
+        {"MCP_LLM_CONCURRENCY": "2", "AEYEGUARD_MAX_CODE_CHARS": "200"}, lmstudio
+    )
+    requests = [
+        AnalysisRequest(code=_java_code(name, 10), language="java") for name in ("A", "B")
+    ]
+    chunks = sum(len(service.llm_service.split_code(request.code)) for request in requests)
+
+    asyncio.run(service.analyze_batch(requests))
+
+    assert lmstudio.calls == chunks > 2, (lmstudio.calls, chunks)
+    assert lmstudio.peak == 2, f"Expected at most 2 requests in flight, got {lmstudio.peak}"
+    print(f"✓ {chunks} chunk requests never exceeded 2 in flight")
+
+
+def test_batch_with_invalid_item():
+    """Test that a batch with an unsupported language fails before any LLM call"""
+    print("\nTesting batch with an unsupported language...")
+
+    lmstudio = FakeLMStudio()
+    service = _make_service({}, lmstudio)
+    requests = [
+        AnalysisRequest(code=_java_code("A", 1), language="java"),
+        AnalysisRequest(code="SELECT 1", language="cobol"),
+    ]
+
+    try:
+        asyncio.run(service.analyze_batch(requests))
+    except HTTPException as e:
+        assert e.status_code == 400 and "Request 1" in e.detail, e.detail
+    else:
+        raise AssertionError("Expected the batch to be rejected")
+
+    assert lmstudio.calls == 0, f"No analysis should start, got {lmstudio.calls} LLM calls"
+    print("✓ Batch rejected with the failing index and no LLM calls")
+
+
+def test_batch_failure_cancels_siblings():
+    """Test that a failed analysis cancels the rest of its batch"""
+    print("\nTesting batch failure cancellation...")
+
+    lmstudio = FakeLMStudio(delay=0.2)
+    service = _make_service({}, lmstudio)
+
+    # LLM errors become error results, so make an analyzer itself fail
+    async def broken_analyze(*args, **kwargs):
+        raise RuntimeError("analyzer crashed")
+
+    service.analyzers[LanguageType.CSHARP].analyze = broken_analyze
+    requests = [
+        AnalysisRequest(code=_java_code("Slow", 1), language="java"),
+        AnalysisRequest(code="public class Broken {}", language="csharp"),
+    ]
+
+    async def run():
+        try:
+            await service.analyze_batch(requests)
+        except HTTPException as e:
+            assert e.status_code == 500, e.status_code
+        else:
+            raise AssertionError("Expected the batch to fail")
+        # Give an orphaned analysis time to finish its LLM call
+        await asyncio.sleep(0.3)
+
+    asyncio.run(run())
+    assert lmstudio.calls == 1 and lmstudio.completed == 0, (lmstudio.calls, lmstudio.completed)
+    print("✓ Remaining analyses are cancelled when one fails")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("MCP Service Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        test_llm_concurrency_limit()
+        test_batch_with_invalid_item()
+        test_batch_failure_cancels_siblings()
+
+        print()
+        print("=" * 60)
+        print("✓ All tests passed!")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print()
+        print("=" * 60)
+        print(f"✗ Test failed: {e}")
+        print("=" * 60)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()